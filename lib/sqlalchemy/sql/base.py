@@ -602,12 +602,16 @@ class ColumnCollection(object):
 
     """
 
-    __slots__ = "_collection", "_index", "_colset"
+    __slots__ = "_keys", "_cols", "_index", "_colset"
 
     def __init__(self, columns=None):
         object.__setattr__(self, "_colset", set())
         object.__setattr__(self, "_index", {})
-        object.__setattr__(self, "_collection", [])
+        # keys and columns are stored in two parallel lists, rather than
+        # as a list of (key, column) tuples, so that iteration of either
+        # one is a plain list copy.
+        object.__setattr__(self, "_keys", [])
+        object.__setattr__(self, "_cols", [])
         if columns:
             self._initial_populate(columns)
 
@@ -616,23 +620,27 @@ class ColumnCollection(object):
 
     @property
     def _all_columns(self):
-        return [col for (k, col) in self._collection]
+        return list(self._cols)
 
     def keys(self):
-        return [k for (k, col) in self._collection]
+        return list(self._keys)
 
     def __len__(self):
-        return len(self._collection)
+        return len(self._cols)
 
     def __iter__(self):
         # turn to a list first to maintain over a course of changes
-        return iter([col for k, col in self._collection])
+        return iter(list(self._cols))
 
     def __getitem__(self, key):
         try:
             return self._index[key]
         except KeyError:
+            # _index is keyed on string names only; integer positions
+            # are served from the column list directly
             if isinstance(key, util.int_types):
+                if 0 <= key < len(self._cols):
+                    return self._cols[key]
                 raise IndexError(key)
             else:
                 raise
@@ -645,7 +653,9 @@ class ColumnCollection(object):
 
     def __contains__(self, key):
         if key not in self._index:
-            if not isinstance(key, util.string_types):
+            if isinstance(key, util.int_types) and 0 <= key < len(self._cols):
+                return True
+            elif not isinstance(key, util.string_types):
                 raise exc.ArgumentError(
                     "__contains__ requires a string argument"
                 )
@@ -664,9 +674,11 @@ class ColumnCollection(object):
         return self.compare(other)
 
     def get(self, key, default=None):
-        if key in self._index:
+        try:
             return self._index[key]
-        else:
+        except KeyError:
+            if isinstance(key, util.int_types) and 0 <= key < len(self._cols):
+                return self._cols[key]
             return default
 
     def __str__(self):
@@ -695,33 +707,41 @@ class ColumnCollection(object):
     def _populate_separate_keys(self, iter_):
         """populate from an iterator of (key, column)"""
         cols = list(iter_)
-        self._collection[:] = cols
-        self._colset.update(c for k, c in self._collection)
-        self._index.update(
-            (idx, c) for idx, (k, c) in enumerate(self._collection)
-        )
-        self._index.update({k: col for k, col in reversed(self._collection)})
+        self._keys[:] = [k for k, c in cols]
+        self._cols[:] = [c for k, c in cols]
+        self._colset.update(self._cols)
+        # iterate in reverse so that the first column for a given key wins
+        self._index.update(reversed(cols))
 
     def add(self, column, key=None):
         if key is None:
             key = column.key
 
-        l = len(self._collection)
-        self._collection.append((key, column))
+        self._keys.append(key)
+        self._cols.append(column)
         self._colset.add(column)
-        self._index[l] = column
         if key not in self._index:
             self._index[key] = column
 
     def __getstate__(self):
-        return {"_collection": self._collection, "_index": self._index}
+        return (self._keys, self._cols, self._index)
 
     def __setstate__(self, state):
-        object.__setattr__(self, "_index", state["_index"])
-        object.__setattr__(self, "_collection", state["_collection"])
-        object.__setattr__(
-            self, "_colset", {col for k, col in self._collection}
-        )
+        if isinstance(state, dict):
+            # state pickled by an older version, which stored a list
+            # of (key, column) tuples and also indexed integer positions
+            collection = state["_collection"]
+            keys = [k for k, c in collection]
+            cols = [c for k, c in collection]
+            index = state["_index"]
+            for key in [k for k in index if isinstance(k, util.int_types)]:
+                del index[key]
+        else:
+            keys, cols, index = state
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_keys", keys)
+        object.__setattr__(self, "_cols", cols)
+        object.__setattr__(self, "_colset", set(cols))
 
     def contains_column(self, col):
         return col in self._colset
@@ -768,8 +788,7 @@ class ColumnCollection(object):
             return column
         col, intersect = None, None
         target_set = column.proxy_set
-        cols = [c for (k, c) in self._collection]
-        for c in cols:
+        for c in self._cols:
             expanded_proxy_set = set(_expand_cloned(c.proxy_set))
             i = target_set.intersection(expanded_proxy_set)
             if i and (
@@ -860,10 +879,9 @@ class DedupeColumnCollection(ColumnCollection):
             # in a _make_proxy operation
             util.memoized_property.reset(column, "proxy_set")
         else:
-            l = len(self._collection)
-            self._collection.append((key, column))
+            self._keys.append(key)
+            self._cols.append(column)
             self._colset.add(column)
-            self._index[l] = column
             self._index[key] = column
 
     def _populate_separate_keys(self, iter_):
@@ -883,11 +901,9 @@ class DedupeColumnCollection(ColumnCollection):
                 replace_col.append(col)
             else:
                 self._index[k] = col
-                self._collection.append((k, col))
-        self._colset.update(c for (k, c) in self._collection)
-        self._index.update(
-            (idx, c) for idx, (k, c) in enumerate(self._collection)
-        )
+                self._keys.append(k)
+                self._cols.append(col)
+        self._colset.update(self._cols)
         for col in replace_col:
             self.replace(col)
 
@@ -902,14 +918,12 @@ class DedupeColumnCollection(ColumnCollection):
             )
         del self._index[column.key]
         self._colset.remove(column)
-        self._collection[:] = [
-            (k, c) for (k, c) in self._collection if c is not column
-        ]
-        self._index.update(
-            {idx: col for idx, (k, col) in enumerate(self._collection)}
-        )
-        # delete higher index
-        del self._index[len(self._collection)]
+
+        for pos, c in enumerate(self._cols):
+            if c is column:
+                break
+        del self._keys[pos]
+        del self._cols[pos]
 
     def replace(self, column):
         """add the given column to this collection, removing unaliased
@@ -938,30 +952,32 @@ class DedupeColumnCollection(ColumnCollection):
         if column.key in self._index:
             remove_col.add(self._index[column.key])
 
+        new_keys = []
         new_cols = []
         replaced = False
-        for k, col in self._collection:
+        for k, col in zip(self._keys, self._cols):
             if col in remove_col:
                 if not replaced:
                     replaced = True
-                    new_cols.append((column.key, column))
+                    new_keys.append(column.key)
+                    new_cols.append(column)
             else:
-                new_cols.append((k, col))
+                new_keys.append(k)
+                new_cols.append(col)
 
         if remove_col:
             self._colset.difference_update(remove_col)
 
         if not replaced:
-            new_cols.append((column.key, column))
+            new_keys.append(column.key)
+            new_cols.append(column)
 
         self._colset.add(column)
-        self._collection[:] = new_cols
+        self._keys[:] = new_keys
+        self._cols[:] = new_cols
 
         self._index.clear()
-        self._index.update(
-            {idx: col for idx, (k, col) in enumerate(self._collection)}
-        )
-        self._index.update(self._collection)
+        self._index.update(zip(self._keys, self._cols))
 
 
 class ImmutableColumnCollection(util.ImmutableContainer, ColumnCollection):
@@ -971,7 +987,8 @@ class ImmutableColumnCollection(util.ImmutableContainer, ColumnCollection):
         object.__setattr__(self, "_parent", collection)
         object.__setattr__(self, "_colset", collection._colset)
         object.__setattr__(self, "_index", collection._index)
-        object.__setattr__(self, "_collection", collection._collection)
+        object.__setattr__(self, "_keys", collection._keys)
+        object.__setattr__(self, "_cols", collection._cols)
 
     def __getstate__(self):
         return {"_parent": self._parent}
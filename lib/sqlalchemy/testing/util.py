@@ -60,10 +60,17 @@ def picklers():
 
     picklers.add(pickle)
 
-    # yes, this thing needs this much testing
+    # yes, this thing needs this much testing.  protocols -1 and -2
+    # are both the same as HIGHEST_PROTOCOL, so just run the explicit
+    # protocol numbers, including the highest one.
     for pickle_ in picklers:
-        for protocol in range(-2, pickle.HIGHEST_PROTOCOL):
-            yield pickle_.loads, lambda d: pickle_.dumps(d, protocol)
+        for protocol in range(0, pickle.HIGHEST_PROTOCOL + 1):
+            yield (
+                pickle_.loads,
+                lambda d, pickle_=pickle_, protocol=protocol: pickle_.dumps(
+                    d, protocol
+                ),
+            )
 
 
 def round_decimal(value, prec):
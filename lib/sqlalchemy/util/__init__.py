@@ -68,6 +68,7 @@ from .compat import print_  # noqa
 from .compat import py2k  # noqa
 from .compat import py33  # noqa
 from .compat import py36  # noqa
+from .compat import py37  # noqa
 from .compat import py3k  # noqa
 from .compat import pypy  # noqa
 from .compat import quote_plus  # noqa
@@ -9,6 +9,7 @@
 
 from __future__ import absolute_import
 
+import itertools
 import operator
 import types
 import weakref
@@ -17,6 +18,7 @@ from .compat import binary_types
 from .compat import collections_abc
 from .compat import itertools_filterfalse
 from .compat import py2k
+from .compat import py37
 from .compat import string_types
 from .compat import threading
 
@@ -223,10 +225,7 @@ class Properties(object):
         self._data.update(value)
 
     def get(self, key, default=None):
-        if key in self:
-            return self[key]
-        else:
-            return default
+        return self._data.get(key, default)
 
     def keys(self):
         return list(self._data)
@@ -260,101 +259,144 @@ class ImmutableProperties(ImmutableContainer, Properties):
     __slots__ = ()
 
 
-class OrderedDict(dict):
-    """A dict that returns keys/values/items in the order they were added."""
+if py37:
 
-    __slots__ = ("_list",)
+    class OrderedDict(dict):
+        """A dict that returns keys/values/items in the order they were added.
 
-    def __reduce__(self):
-        return OrderedDict, (self.items(),)
+        The builtin ``dict`` maintains insertion order as of Python 3.7,
+        so this is a thin subclass which adds :meth:`.sort` and pickling /
+        copying which produce an :class:`.OrderedDict`.  As with the
+        previous implementation, :meth:`.keys`, :meth:`.values` and
+        :meth:`.items` return list snapshots rather than live views, so
+        that the dictionary may be modified while iterating them.
 
-    def __init__(self, ____sequence=None, **kwargs):
-        self._list = []
-        if ____sequence is None:
-            if kwargs:
-                self.update(**kwargs)
-        else:
-            self.update(____sequence, **kwargs)
+        """
 
-    def clear(self):
-        self._list = []
-        dict.clear(self)
+        __slots__ = ()
 
-    def copy(self):
-        return self.__copy__()
+        def __reduce__(self):
+            return OrderedDict, (self.items(),)
+
+        def keys(self):
+            return list(dict.keys(self))
+
+        def values(self):
+            return list(dict.values(self))
+
+        def items(self):
+            return list(dict.items(self))
+
+        def copy(self):
+            return self.__copy__()
+
+        def __copy__(self):
+            return OrderedDict(self)
+
+        def sort(self, *arg, **kw):
+            items = [(key, self[key]) for key in sorted(self, *arg, **kw)]
+            dict.clear(self)
+            dict.update(self, items)
+
+
+else:
 
-    def __copy__(self):
-        return OrderedDict(self)
+    class OrderedDict(dict):
+        """A dict that returns keys/values/items in the order they were
+        added."""
 
-    def sort(self, *arg, **kw):
-        self._list.sort(*arg, **kw)
+        __slots__ = ("_list",)
 
-    def update(self, ____sequence=None, **kwargs):
-        if ____sequence is not None:
-            if hasattr(____sequence, "keys"):
-                for key in ____sequence.keys():
-                    self.__setitem__(key, ____sequence[key])
+        def __reduce__(self):
+            return OrderedDict, (self.items(),)
+
+        def __init__(self, ____sequence=None, **kwargs):
+            self._list = []
+            if ____sequence is None:
+                if kwargs:
+                    self.update(**kwargs)
             else:
-                for key, value in ____sequence:
-                    self[key] = value
-        if kwargs:
-            self.update(kwargs)
+                self.update(____sequence, **kwargs)
 
-    def setdefault(self, key, value):
-        if key not in self:
-            self.__setitem__(key, value)
-            return value
-        else:
-            return self.__getitem__(key)
+        def clear(self):
+            self._list = []
+            dict.clear(self)
 
-    def __iter__(self):
-        return iter(self._list)
+        def copy(self):
+            return self.__copy__()
 
-    def keys(self):
-        return list(self)
+        def __copy__(self):
+            return OrderedDict(self)
 
-    def values(self):
-        return [self[key] for key in self._list]
+        def sort(self, *arg, **kw):
+            self._list.sort(*arg, **kw)
 
-    def items(self):
-        return [(key, self[key]) for key in self._list]
+        def update(self, ____sequence=None, **kwargs):
+            if ____sequence is not None:
+                if hasattr(____sequence, "keys"):
+                    for key in ____sequence.keys():
+                        self.__setitem__(key, ____sequence[key])
+                else:
+                    for key, value in ____sequence:
+                        self[key] = value
+            if kwargs:
+                self.update(kwargs)
 
-    if py2k:
+        def setdefault(self, key, value):
+            if key not in self:
+                self.__setitem__(key, value)
+                return value
+            else:
+                return self.__getitem__(key)
 
-        def itervalues(self):
-            return iter(self.values())
+        def __iter__(self):
+            return iter(self._list)
 
-        def iterkeys(self):
-            return iter(self)
+        def keys(self):
+            return list(self)
 
-        def iteritems(self):
-            return iter(self.items())
+        def values(self):
+            return [self[key] for key in self._list]
 
-    def __setitem__(self, key, obj):
-        if key not in self:
-            try:
-                self._list.append(key)
-            except AttributeError:
-                # work around Python pickle loads() with
-                # dict subclass (seems to ignore __setstate__?)
-                self._list = [key]
-        dict.__setitem__(self, key, obj)
+        def items(self):
+            return [(key, self[key]) for key in self._list]
 
-    def __delitem__(self, key):
-        dict.__delitem__(self, key)
-        self._list.remove(key)
+        if py2k:
+
+            def itervalues(self):
+                return iter(self.values())
+
+            def iterkeys(self):
+                return iter(self)
+
+            def iteritems(self):
+                return iter(self.items())
+
+        def __setitem__(self, key, obj):
+            if key not in self:
+                try:
+                    self._list.append(key)
+                except AttributeError:
+                    # work around Python pickle loads() with
+                    # dict subclass (seems to ignore __setstate__?)
+                    self._list = [key]
+            dict.__setitem__(self, key, obj)
 
-    def pop(self, key, *default):
-        present = key in self
-        value = dict.pop(self, key, *default)
-        if present:
+        def __delitem__(self, key):
+            dict.__delitem__(self, key)
             self._list.remove(key)
-        return value
 
-    def popitem(self):
-        item = dict.popitem(self)
-        self._list.remove(item[0])
-        return item
+        def pop(self, key, *default):
+            present = key in self
+            value = dict.pop(self, key, *default)
+            if present:
+                self._list.remove(key)
+            return value
+
+        def popitem(self):
+            item = dict.popitem(self)
+            self._list.remove(item[0])
+            return item
 
 
 class OrderedSet(set):
@@ -472,13 +514,10 @@ class IdentitySet(object):
 
     """
 
-    _working_set = set
-
     def __init__(self, iterable=None):
         self._members = dict()
         if iterable:
-            for o in iterable:
-                self.add(o)
+            self._members.update(_iter_id(iterable))
 
     def add(self, value):
         self._members[id(value)] = value
@@ -490,10 +529,7 @@ class IdentitySet(object):
         del self._members[id(value)]
 
     def discard(self, value):
-        try:
-            self.remove(value)
-        except KeyError:
-            pass
+        self._members.pop(id(value), None)
 
     def pop(self):
         try:
@@ -521,12 +557,12 @@ class IdentitySet(object):
             return True
 
     def issubset(self, iterable):
-        other = type(self)(iterable)
+        other = _id_dict(iterable)
 
         if len(self) > len(other):
             return False
         for m in itertools_filterfalse(
-            other._members.__contains__, iter(self._members.keys())
+            other.__contains__, iter(self._members.keys())
         ):
             return False
         return True
@@ -542,13 +578,13 @@ class IdentitySet(object):
         return len(self) < len(other) and self.issubset(other)
 
     def issuperset(self, iterable):
-        other = type(self)(iterable)
+        other = _id_dict(iterable)
 
         if len(self) < len(other):
             return False
 
         for m in itertools_filterfalse(
-            self._members.__contains__, iter(other._members.keys())
+            self._members.__contains__, iter(other.keys())
         ):
             return False
         return True
@@ -565,10 +601,8 @@ class IdentitySet(object):
 
     def union(self, iterable):
         result = type(self)()
-        # testlib.pragma exempt:__hash__
-        members = self._member_id_tuples()
-        other = _iter_id(iterable)
-        result._members.update(self._working_set(members).union(other))
+        result._members.update(self._members)
+        result._members.update(_iter_id(iterable))
         return result
 
     def __or__(self, other):
@@ -587,10 +621,10 @@ class IdentitySet(object):
 
     def difference(self, iterable):
         result = type(self)()
-        # testlib.pragma exempt:__hash__
-        members = self._member_id_tuples()
-        other = _iter_id(iterable)
-        result._members.update(self._working_set(members).difference(other))
+        other = _id_dict(iterable)
+        result._members.update(
+            (k, v) for k, v in self._members.items() if k not in other
+        )
         return result
 
     def __sub__(self, other):
@@ -609,10 +643,10 @@ class IdentitySet(object):
 
     def intersection(self, iterable):
         result = type(self)()
-        # testlib.pragma exempt:__hash__
-        members = self._member_id_tuples()
-        other = _iter_id(iterable)
-        result._members.update(self._working_set(members).intersection(other))
+        other = _id_dict(iterable)
+        result._members.update(
+            (k, v) for k, v in self._members.items() if k in other
+        )
         return result
 
     def __and__(self, other):
@@ -631,17 +665,15 @@ class IdentitySet(object):
 
     def symmetric_difference(self, iterable):
         result = type(self)()
-        # testlib.pragma exempt:__hash__
-        members = self._member_id_tuples()
-        other = _iter_id(iterable)
+        other = _id_dict(iterable)
         result._members.update(
-            self._working_set(members).symmetric_difference(other)
+            (k, v) for k, v in self._members.items() if k not in other
+        )
+        result._members.update(
+            (k, v) for k, v in other.items() if k not in self._members
         )
         return result
 
-    def _member_id_tuples(self):
-        return ((id(v), v) for v in self._members.values())
-
     def __xor__(self, other):
         if not isinstance(other, IdentitySet):
             return NotImplemented
@@ -676,47 +708,46 @@ class IdentitySet(object):
 
 class WeakSequence(object):
     def __init__(self, __elements=()):
-        self._storage = [
-            weakref.ref(element, self._remove) for element in __elements
-        ]
+        # elements are stored under an ascending integer key, so that
+        # an element being garbage collected removes its entry from the
+        # dictionary directly, rather than searching a list for it
+        self._counter = itertools.count()
+        self._storage = weakref.WeakValueDictionary(
+            (next(self._counter), element) for element in __elements
+        )
 
     def append(self, item):
-        self._storage.append(weakref.ref(item, self._remove))
-
-    def _remove(self, ref):
-        self._storage.remove(ref)
+        self._storage[next(self._counter)] = item
 
     def __len__(self):
         return len(self._storage)
 
-    def __iter__(self):
-        return (
-            obj for obj in (ref() for ref in self._storage) if obj is not None
-        )
+    if py37:
+
+        def __iter__(self):
+            return iter(list(self._storage.values()))
+
+    else:
+
+        def __iter__(self):
+            # sort on the integer keys, as dictionary ordering is not
+            # guaranteed on older Python versions
+            return iter([obj for key, obj in sorted(self._storage.items())])
 
     def __getitem__(self, index):
-        try:
-            obj = self._storage[index]
-        except KeyError:
-            raise IndexError("Index %s out of range" % index)
-        else:
-            return obj()
+        return list(self)[index]
 
 
 class OrderedIdentitySet(IdentitySet):
-    class _working_set(OrderedSet):
-        # a testing pragma: exempt the OIDS working set from the test suite's
-        # "never call the user's __hash__" assertions.  this is a big hammer,
-        # but it's safe here: IDS operates on (id, instance) tuples in the
-        # working set.
-        __sa_hash_exempt__ = True
+    # on Python 3.7 and above the plain dict used by IdentitySet
+    # already preserves insertion order
+    if not py37:
 
-    def __init__(self, iterable=None):
-        IdentitySet.__init__(self)
-        self._members = OrderedDict()
-        if iterable:
-            for o in iterable:
-                self.add(o)
+        def __init__(self, iterable=None):
+            IdentitySet.__init__(self)
+            self._members = OrderedDict()
+            if iterable:
+                self._members.update(_iter_id(iterable))
 
 
 class PopulateDict(dict):
@@ -799,11 +830,18 @@ def coerce_generator_arg(arg):
         return arg
 
 
+_str_and_bytes_types = string_types + binary_types
+
+
 def to_list(x, default=None):
-    if x is None:
+    # a plain list is by far the most common argument; check for it
+    # ahead of the more expensive ABC-based isinstance() checks
+    if type(x) is list:
+        return x
+    elif x is None:
         return default
-    if not isinstance(x, collections_abc.Iterable) or isinstance(
-        x, string_types + binary_types
+    elif not isinstance(x, collections_abc.Iterable) or isinstance(
+        x, _str_and_bytes_types
     ):
         return [x]
     elif isinstance(x, list):
@@ -856,12 +894,16 @@ def flatten_iterator(x):
     iterators, flatten the sub-elements into a single iterator.
 
     """
-    for elem in x:
-        if not isinstance(elem, str) and hasattr(elem, "__iter__"):
-            for y in flatten_iterator(elem):
-                yield y
+    stack = [iter(x)]
+    while stack:
+        for elem in stack[-1]:
+            if not isinstance(elem, str) and hasattr(elem, "__iter__"):
+                stack.append(iter(elem))
+                break
+            else:
+                yield elem
         else:
-            yield elem
+            stack.pop()
 
 
 class LRUCache(dict):
@@ -887,17 +929,22 @@ class LRUCache(dict):
         self._counter += 1
         return self._counter
 
+    # get() and __getitem__() are the cache-hit paths; they bump the
+    # counter inline rather than calling _inc_counter()
+
     def get(self, key, default=None):
         item = dict.get(self, key, default)
         if item is not default:
-            item[2] = self._inc_counter()
+            self._counter += 1
+            item[2] = self._counter
             return item[1]
         else:
             return default
 
     def __getitem__(self, key):
         item = dict.__getitem__(self, key)
-        item[2] = self._inc_counter()
+        self._counter += 1
+        item[2] = self._counter
         return item[1]
 
     def values(self):
@@ -945,7 +992,11 @@ class LRUCache(dict):
             self._mutex.release()
 
 
-_lw_tuples = LRUCache(100)
+# generated classes are keyed on (name, field, field, ...); the capacity
+# here is sized so that an application with a large number of distinct
+# Query shapes keeps reusing the same class per shape, rather than
+# re-synthesizing classes each time the cache is pruned.
+_lw_tuples = LRUCache(1000)
 
 
 def lightweight_named_tuple(name, fields):
@@ -954,18 +1005,13 @@ def lightweight_named_tuple(name, fields):
     if tp_cls:
         return tp_cls
 
-    tp_cls = type(
-        name,
-        (_LW,),
-        dict(
-            [
-                (field, _property_getters[idx])
-                for idx, field in enumerate(fields)
-                if field is not None
-            ]
-            + [("__slots__", ())]
-        ),
-    )
+    cls_dict = {
+        field: _property_getters[idx]
+        for idx, field in enumerate(fields)
+        if field is not None
+    }
+    cls_dict["__slots__"] = ()
+    tp_cls = type(name, (_LW,), cls_dict)
 
     tp_cls._real_fields = fields
     tp_cls._fields = tuple([f for f in fields if f is not None])
@@ -1067,6 +1113,16 @@ def _iter_id(iterable):
         yield id(item), item
 
 
+def _id_dict(iterable):
+    """Return a dict of {id(o): o} for the given iterable, using the
+    existing member dictionary if given an :class:`.IdentitySet`."""
+
+    if isinstance(iterable, IdentitySet):
+        return iterable._members
+    else:
+        return dict(_iter_id(iterable))
+
+
 def has_dupes(sequence, target):
     """Given a sequence and search object, return True if there's more
     than one, False if zero or one of them.
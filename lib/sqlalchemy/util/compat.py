@@ -14,6 +14,7 @@ import operator
 import sys
 
 
+py37 = sys.version_info >= (3, 7)
 py36 = sys.version_info >= (3, 6)
 py33 = sys.version_info >= (3, 3)
 py35 = sys.version_info >= (3, 5)
@@ -423,7 +424,7 @@ else:
     class timezone(tzinfo):
         """Minimal port of python 3 timezone object"""
 
-        __slots__ = "_offset"
+        __slots__ = "_offset", "_name"
 
         def __init__(self, offset):
             if not isinstance(offset, timedelta):
@@ -457,7 +458,11 @@ else:
             return self._offset
 
         def tzname(self, dt):
-            return self._name_from_offset(self._offset)
+            try:
+                return self._name
+            except AttributeError:
+                self._name = name = self._name_from_offset(self._offset)
+                return name
 
         def dst(self, dt):
             return None
@@ -19,6 +19,7 @@ import sys
 import textwrap
 import types
 import warnings
+import weakref
 
 from . import _collections
 from . import compat
@@ -294,9 +295,17 @@ def get_cls_kwargs(cls, _set=None):
 
     No anonymous tuple arguments please !
 
+    The result for a top-level call is memoized per class and returned
+    as a frozenset.  If a class' ``__init__`` is replaced at runtime,
+    call ``get_cls_kwargs.cache_clear()`` to discard memoized results.
+
     """
     toplevel = _set is None
     if toplevel:
+        try:
+            return _cls_kwargs_cache[cls]
+        except KeyError:
+            pass
         _set = set()
 
     ctr = cls.__dict__.get("__init__", False)
@@ -320,9 +329,15 @@ def get_cls_kwargs(cls, _set=None):
                 break
 
     _set.discard("self")
+    if toplevel:
+        _cls_kwargs_cache[cls] = _set = frozenset(_set)
     return _set
 
 
+_cls_kwargs_cache = weakref.WeakKeyDictionary()
+get_cls_kwargs.cache_clear = _cls_kwargs_cache.clear
+
+
 def get_func_kwargs(func):
     """Return the set of legal kwargs for the given `func`.
 
@@ -535,14 +550,71 @@ def generic_repr(obj, additional_kw=(), to_inspect=None, omit_kwarg=()):
     else:
         to_inspect = _collections.to_list(to_inspect)
 
-    missing = object()
+    # key the plan on the class-level __init__, so that neither a bound
+    # method nor a C-level method-wrapper, both of which reference the
+    # instance, is held by the cache
+    inits = tuple(_class_init(insp) for insp in to_inspect)
+    try:
+        plan = _generic_repr_plans[inits]
+    except KeyError:
+        plan = _generic_repr_plans[inits] = _generic_repr_plan(inits)
+    pos_args, vargs, kw_args = plan
+
+    missing = _generic_repr_missing
+    output = []
+
+    output.extend(repr(getattr(obj, arg, None)) for arg in pos_args)
+
+    if vargs is not None and hasattr(obj, vargs):
+        output.extend([repr(val) for val in getattr(obj, vargs)])
+
+    for arg, defval in kw_args:
+        if arg in omit_kwarg:
+            continue
+        try:
+            val = getattr(obj, arg, missing)
+            if val is not missing and val != defval:
+                output.append("%s=%r" % (arg, val))
+        except Exception:
+            pass
+
+    if additional_kw:
+        for arg, defval in additional_kw:
+            try:
+                val = getattr(obj, arg, missing)
+                if val is not missing and val != defval:
+                    output.append("%s=%r" % (arg, val))
+            except Exception:
+                pass
+
+    return "%s(%s)" % (obj.__class__.__name__, ", ".join(output))
+
+
+_generic_repr_missing = object()
+
+
+def _class_init(insp):
+    """Return the __init__ of the given class, or of an instance's class,
+    as found on the class itself."""
+
+    cls = insp if isinstance(insp, type) else insp.__class__
+    init = cls.__init__
+    return getattr(init, "__func__", init)
+
+_generic_repr_plans = _collections.LRUCache(100)
+
+
+def _generic_repr_plan(inits):
+    """Given a tuple of __init__ functions, return the positional argument
+    names, the varargs name and the (name, default) pairs of keyword
+    arguments used by generic_repr()."""
 
     pos_args = []
     kw_args = _collections.OrderedDict()
     vargs = None
-    for i, insp in enumerate(to_inspect):
+    for i, init in enumerate(inits):
         try:
-            spec = compat.inspect_getfullargspec(insp.__init__)
+            spec = compat.inspect_getfullargspec(init)
         except TypeError:
             continue
         else:
@@ -556,7 +628,10 @@ def generic_repr(obj, additional_kw=(), to_inspect=None, omit_kwarg=()):
                     pos_args.extend(spec.args[1:])
             else:
                 kw_args.update(
-                    [(arg, missing) for arg in spec.args[1:-default_len]]
+                    [
+                        (arg, _generic_repr_missing)
+                        for arg in spec.args[1:-default_len]
+                    ]
                 )
 
             if default_len:
@@ -568,33 +643,7 @@ def generic_repr(obj, additional_kw=(), to_inspect=None, omit_kwarg=()):
                         )
                     ]
                 )
-    output = []
-
-    output.extend(repr(getattr(obj, arg, None)) for arg in pos_args)
-
-    if vargs is not None and hasattr(obj, vargs):
-        output.extend([repr(val) for val in getattr(obj, vargs)])
-
-    for arg, defval in kw_args.items():
-        if arg in omit_kwarg:
-            continue
-        try:
-            val = getattr(obj, arg, missing)
-            if val is not missing and val != defval:
-                output.append("%s=%r" % (arg, val))
-        except Exception:
-            pass
-
-    if additional_kw:
-        for arg, defval in additional_kw:
-            try:
-                val = getattr(obj, arg, missing)
-                if val is not missing and val != defval:
-                    output.append("%s=%r" % (arg, val))
-            except Exception:
-                pass
-
-    return "%s(%s)" % (obj.__class__.__name__, ", ".join(output))
+    return tuple(pos_args), vargs, tuple(kw_args.items())
 
 
 class portable_instancemethod(object):
@@ -854,6 +903,11 @@ def as_interface(obj, cls=None, methods=None, required=None):
 class memoized_property(object):
     """A read-only @property that is only evaluated once."""
 
+    # note this is deliberately a non-data descriptor, i.e. there is no
+    # __set__(); once the value is placed in the instance __dict__,
+    # attribute access finds it there directly and __get__() is
+    # never called again for that instance.
+
     def __init__(self, fget, doc=None):
         self.fget = fget
         self.__doc__ = doc or fget.__doc__
@@ -1362,6 +1416,11 @@ class symbol(object):
     _lock = compat.threading.Lock()
 
     def __new__(cls, name, doc=None, canonical=None):
+        # symbols are never removed, so an existing one can be returned
+        # without taking the lock
+        sym = cls.symbols.get(name)
+        if sym is not None:
+            return sym
         cls._lock.acquire()
         try:
             sym = cls.symbols.get(name)
@@ -1590,10 +1649,11 @@ def wrap_callable(wrapper, fn):
         if hasattr(fn, "__module__"):
             _f.__module__ = fn.__module__
 
-        if hasattr(fn.__call__, "__doc__") and fn.__call__.__doc__:
-            _f.__doc__ = fn.__call__.__doc__
-        elif fn.__doc__:
-            _f.__doc__ = fn.__doc__
+        # fn.__call__ produces a new bound method on each access, so
+        # fetch it and its docstring only once
+        doc = getattr(fn.__call__, "__doc__", None) or fn.__doc__
+        if doc:
+            _f.__doc__ = doc
 
         return _f
 
@@ -4,6 +4,7 @@ import copy
 import datetime
 import inspect
 import sys
+import weakref
 
 from sqlalchemy import exc
 from sqlalchemy import sql
@@ -155,6 +156,18 @@ class LWKeyedTupleTest(_KeyedTupleTest, fixtures.TestBase):
     def _fixture(self, values, labels):
         return util.lightweight_named_tuple("n", labels)(values)
 
+    def test_class_is_cached(self):
+        kt1 = self._fixture([1, 2], ["a", "b"])
+        kt2 = self._fixture([3, 4], ["a", "b"])
+        kt3 = self._fixture([5, 6], ["a", "c"])
+
+        is_(type(kt1), type(kt2))
+        ne_(type(kt1), type(kt3))
+
+    def test_no_instance_dict(self):
+        keyed_tuple = self._fixture([1, 2], ["a", "b"])
+        assert not hasattr(keyed_tuple, "__dict__")
+
 
 class WeakSequenceTest(fixtures.TestBase):
     @testing.requires.predictable_gc
@@ -188,6 +201,21 @@ class WeakSequenceTest(fixtures.TestBase):
         eq_(len(w), 2)
         eq_(len(w._storage), 2)
 
+    @testing.requires.predictable_gc
+    def test_ordering_after_cleanout(self):
+        class Foo(object):
+            pass
+
+        f1, f2, f3, f4 = Foo(), Foo(), Foo(), Foo()
+        w = WeakSequence([f1, f2])
+        w.append(f3)
+        w.append(f4)
+        del f2
+        gc_collect()
+        eq_(list(w), [f1, f3, f4])
+        is_(w[1], f3)
+        assert_raises(IndexError, lambda: w[3])
+
 
 class OrderedDictTest(fixtures.TestBase):
     def test_odict(self):
@@ -250,9 +278,38 @@ class OrderedDictTest(fixtures.TestBase):
 
         o2 = o.copy()
         eq_(list(o2.keys()), list(o.keys()))
+        is_true(isinstance(o2, util.OrderedDict))
 
         o3 = copy.copy(o)
         eq_(list(o3.keys()), list(o.keys()))
+        is_true(isinstance(o3, util.OrderedDict))
+
+    def test_odict_mutate_while_iterating(self):
+        o = util.OrderedDict([("a", 1), ("b", 2), ("c", 3)])
+        for key in o.keys():
+            del o[key]
+        eq_(list(o.items()), [])
+
+        o = util.OrderedDict([("a", 1), ("b", 2), ("c", 3)])
+        for key, value in o.items():
+            o[key * 2] = value
+        eq_(
+            list(o.items()),
+            [("a", 1), ("b", 2), ("c", 3), ("aa", 1), ("bb", 2), ("cc", 3)],
+        )
+
+        o = util.OrderedDict([("a", 1), ("b", 2)])
+        for value in o.values():
+            o.pop("b", None)
+        eq_(list(o.keys()), ["a"])
+
+    def test_odict_sort(self):
+        o = util.OrderedDict([("zzz", 1), ("aaa", 3), ("mmm", 2)])
+        o.sort()
+        eq_(list(o.items()), [("aaa", 3), ("mmm", 2), ("zzz", 1)])
+
+        o.sort(key=lambda key: o[key])
+        eq_(list(o.items()), [("zzz", 1), ("mmm", 2), ("aaa", 3)])
 
 
 class OrderedSetTest(fixtures.TestBase):
@@ -291,6 +348,18 @@ class MemoizedAttrTest(fixtures.TestBase):
         eq_(val[0], 21)
         eq_(f1.__dict__["bar"], 20)
 
+    def test_memoized_property_is_nondata(self):
+        class Foo(object):
+            @util.memoized_property
+            def bar(self):
+                return 20
+
+        assert not hasattr(util.memoized_property, "__set__")
+
+        f1 = Foo()
+        f1.__dict__["bar"] = 10
+        eq_(f1.bar, 10)
+
     def test_memoized_instancemethod(self):
         val = [20]
 
@@ -448,12 +517,10 @@ class ToListTest(fixtures.TestBase):
 
 class ColumnCollectionCommon(testing.AssertsCompiledSQL):
     def _assert_collection_integrity(self, coll):
-        eq_(coll._colset, set(c for k, c in coll._collection))
-        d = {}
-        for k, col in coll._collection:
-            d.setdefault(k, col)
-        d.update({idx: col for idx, (k, col) in enumerate(coll._collection)})
-        eq_(coll._index, d)
+        eq_(coll._colset, set(coll._cols))
+        eq_(len(coll._keys), len(coll._cols))
+        # reversed, so that the first column for a given key wins
+        eq_(coll._index, dict(reversed(list(zip(coll._keys, coll._cols)))))
 
     def test_keys(self):
         c1, c2, c3 = sql.column("c1"), sql.column("c2"), sql.column("c3")
@@ -476,6 +543,53 @@ class ColumnCollectionCommon(testing.AssertsCompiledSQL):
         assert_raises(KeyError, lambda: cc["foo"])
         assert_raises(KeyError, lambda: cc[object()])
         assert_raises(IndexError, lambda: cc[5])
+        assert_raises(IndexError, lambda: cc[-1])
+
+    def test_integer_get(self):
+        c1, c2 = sql.column("c1"), sql.column("c2")
+        cc = self._column_collection(columns=[("c1", c1), ("c2", c2)])
+
+        is_(cc.get(0), c1)
+        is_(cc.get(1), c2)
+        is_(cc.get(2), None)
+        is_(cc.get(-1), None)
+        eq_(cc.get(5, "default"), "default")
+
+    def test_integer_in(self):
+        c1, c2 = sql.column("c1"), sql.column("c2")
+        cc = self._column_collection(columns=[("c1", c1), ("c2", c2)])
+
+        assert 0 in cc
+        assert 1 in cc
+
+        for idx in (2, -1):
+            assert_raises_message(
+                exc.ArgumentError,
+                "__contains__ requires a string argument",
+                lambda: idx in cc,
+            )
+
+    def test_setstate_legacy(self):
+        c1, c2 = sql.column("c1"), sql.column("c2")
+        c2.key = "foo"
+
+        proto = self._column_collection()
+        cc = proto.__class__.__new__(proto.__class__)
+        cc.__setstate__(
+            {
+                "_collection": [("c1", c1), ("foo", c2)],
+                "_index": {0: c1, 1: c2, "c1": c1, "foo": c2},
+            }
+        )
+        self._assert_collection_integrity(cc)
+        eq_(cc.keys(), ["c1", "foo"])
+        is_(cc[1], c2)
+
+        for loads, dumps in picklers():
+            cp = loads(dumps(cc))
+            self._assert_collection_integrity(cp)
+            eq_(cp.keys(), ["c1", "foo"])
+            eq_(cp.foo.name, "c2")
 
     def test_contains_column(self):
         c1, c2, c3 = sql.column("c1"), sql.column("c2"), sql.column("c3")
@@ -681,7 +795,8 @@ class DedupeColumnCollectionTest(ColumnCollectionCommon, fixtures.TestBase):
 
             assert cp._colset is cpi._colset
             assert cp._index is cpi._index
-            assert cp._collection is cpi._collection
+            assert cp._keys is cpi._keys
+            assert cp._cols is cpi._cols
 
             cp.add(c3)
 
@@ -1162,6 +1277,12 @@ class FlattenIteratorTest(fixtures.TestBase):
 
         assert list(util.flatten_iterator(iter_list)) == ["asdf", "x", "y"]
 
+    def test_deeply_nested(self):
+        nested = [1]
+        for i in range(2, 5000):
+            nested = [nested, i]
+        eq_(list(util.flatten_iterator(nested)), list(range(1, 5000)))
+
 
 class HashOverride(object):
     def __init__(self, value=None):
@@ -1786,7 +1907,7 @@ class OrderedIdentitySetTest(fixtures.TestBase):
 
 
 class DictlikeIteritemsTest(fixtures.TestBase):
-    baseline = set([("a", 1), ("b", 2), ("c", 3)])
+    baseline = frozenset([("a", 1), ("b", 2), ("c", 3)])
 
     def _ok(self, instance):
         iterator = util.dictlike_iteritems(instance)
@@ -2010,6 +2131,31 @@ class ArgInspectionTest(fixtures.TestBase):
         test(BA2, "a", "b")
         test(A11B1, "a1", "a11", "b", "b1")
 
+    def test_get_cls_kwargs_cached(self):
+        class A(object):
+            def __init__(self, a, b):
+                pass
+
+        result = util.get_cls_kwargs(A)
+        eq_(result, frozenset(["a", "b"]))
+        is_(util.get_cls_kwargs(A), result)
+
+    def test_get_cls_kwargs_cache_clear(self):
+        class A(object):
+            def __init__(self, a):
+                pass
+
+        eq_(util.get_cls_kwargs(A), frozenset(["a"]))
+
+        def __init__(self, b):
+            pass
+
+        A.__init__ = __init__
+        eq_(util.get_cls_kwargs(A), frozenset(["a"]))
+
+        util.get_cls_kwargs.cache_clear()
+        eq_(util.get_cls_kwargs(A), frozenset(["b"]))
+
     def test_get_func_kwargs(self):
         def f1():
             pass
@@ -2627,6 +2773,42 @@ class GenericReprTest(fixtures.TestBase):
 
         eq_(util.generic_repr(Foo(1, 5, 3, 7)), "Foo(b=5, d=7)")
 
+    def test_repeated_instances(self):
+        class Foo(object):
+            def __init__(self, a, b=2):
+                self.a = a
+                self.b = b
+
+        eq_(util.generic_repr(Foo(1)), "Foo(1)")
+        plan = langhelpers._generic_repr_plans[(Foo.__init__,)]
+
+        eq_(util.generic_repr(Foo(3, b=4)), "Foo(3, b=4)")
+        eq_(util.generic_repr(Foo(5, b=2)), "Foo(5)")
+        is_(langhelpers._generic_repr_plans[(Foo.__init__,)], plan)
+
+    def test_plan_does_not_reference_instance(self):
+        class NoInit(object):
+            pass
+
+        class DictSub(dict):
+            pass
+
+        class Foo(object):
+            def __init__(self, a):
+                self.a = a
+
+        for factory in (NoInit, DictSub, lambda: Foo(1)):
+            obj = factory()
+            util.generic_repr(obj)
+            for inits in langhelpers._generic_repr_plans:
+                for init in inits:
+                    is_false(getattr(init, "__self__", None) is obj)
+
+            ref = weakref.ref(obj)
+            del obj
+            gc_collect()
+            is_(ref(), None)
+
     def test_multi_kw(self):
         class Foo(object):
             def __init__(self, a, b, c=3, d=4):